@@ -1,11 +1,16 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
 from pocketflow import Flow
 
 from Leetcode_Agent.utils.logger import get_logger
 from Leetcode_Agent.nodes.user_input_node import UserInputNode
 from Leetcode_Agent.nodes.parse_problem_node import ParseProblemNode
-from Leetcode_Agent.utils.llm_client import LLMClient
+from Leetcode_Agent.utils.llm_client import get_default_llm_client
 from Leetcode_Agent.nodes.exec_python3_node import ExecPython3Node
 from Leetcode_Agent.nodes.code_regen_node import CodeRegenNode
+from Leetcode_Agent.nodes.output_node import OutputNode
 
 
 
@@ -25,21 +30,53 @@ def create_leetcode_flow() -> Flow:
     logger = get_logger("leetcode_flow")
     logger.info("Creating LeetCode workflow")
     
-    llm_client = LLMClient()
+    llm_client = get_default_llm_client()
 
     user_input_node = UserInputNode(llm_client)
     parse_problem_node = ParseProblemNode(llm_client)
     exec_python3_node = ExecPython3Node(llm_client)
     code_regen_node = CodeRegenNode(llm_client)
-    
+    output_node = OutputNode(llm_client)
+
     user_input_node >> parse_problem_node
     parse_problem_node >> exec_python3_node
     exec_python3_node >> code_regen_node
     code_regen_node - "regen" >> parse_problem_node
+    # The analyser's volunteered fix goes straight back to execution; a
+    # re-parse would overwrite it before it ran.
+    code_regen_node - "exec" >> exec_python3_node
+    code_regen_node >> output_node
 
     flow = Flow(user_input_node)
 
-    return flow 
+    return flow
+
+
+def _run_one(shared: Dict[str, Any]) -> Dict[str, Any]:
+    """Build and run one flow in the current (worker) process."""
+    flow = create_leetcode_flow()
+    flow.run(shared)
+    return shared
+
+
+def run_batch(problems: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Solve a batch of problems, one flow per problem, across a process pool.
+
+    A single interpreter serializes all prep/post and formatting work on
+    the GIL; one worker process per problem runs the feedback loops truly
+    in parallel. The flow (and its LLMClient) is constructed inside each
+    worker rather than pickled across the process boundary.
+
+    Args:
+        problems: One shared-state dict per problem, as passed to flow.run
+        max_workers: Pool size (defaults to the CPU count)
+
+    Returns:
+        The shared-state dicts after their flows finish, in input order
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(_run_one, problems))
 
 
 if __name__ == "__main__":
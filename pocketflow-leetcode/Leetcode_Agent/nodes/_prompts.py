@@ -0,0 +1,24 @@
+"""
+Shared prompt-template loading for LeetCode Agent nodes.
+
+Templates never change during the process lifetime, so each file is read
+exactly once and served from the lru_cache afterwards; the prompts
+directory is resolved once at import.
+"""
+
+import functools
+from pathlib import Path
+
+_PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Return the contents of prompts/<name>, cached after the first read.
+
+    Args:
+        name: Template file name, e.g. "problem_analysis.txt"
+    """
+    with open(_PROMPTS_DIR / name, 'r') as f:
+        return f.read()
@@ -4,17 +4,24 @@ Parse Problem Node for LeetCode Agent
 This node parses problem content from URLs or direct descriptions.
 """
 
-import os
+import logging
 import re
-import sys
-import traceback
-import tempfile
-import subprocess
 from typing import Dict, Any
 
 from pocketflow import Node
 from Leetcode_Agent.utils.llm_client import LLMClient
 from Leetcode_Agent.utils.logger import get_logger
+from Leetcode_Agent.utils.semantic_cache import get_semantic_cache
+from Leetcode_Agent.nodes._prompts import load_prompt
+
+# The analyser marks a correct solution with a literal \box{是}; compile
+# the check once instead of on every exec/post call.
+_SOLVED_RE = re.compile("\\\\box{是}")
+
+
+# Fields downstream nodes rely on; merged under the LLM response in one
+# pass instead of per-key existence checks.
+_RESPONSE_DEFAULTS = {"full_text": "", "python3_code": ""}
 
 
 class CodeRegenNode(Node):
@@ -32,7 +39,7 @@ class CodeRegenNode(Node):
         super().__init__()
         self.llm_client = llm_client
         self.logger = get_logger(self.__class__.__name__)
-    
+
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepare the input for processing.
@@ -57,7 +64,28 @@ class CodeRegenNode(Node):
             Dictionary with parsed problem data
         """
 
-        if re.search("\\\\box{是}", inputs["analyse_result"]):
+        # Scan the analyser verdict once; post() reads the stored flag
+        # instead of re-running the regex on the same text.
+        inputs["solved"] = bool(_SOLVED_RE.search(inputs["analyse_result"]))
+        if inputs["solved"]:
+            return inputs
+
+        # Fail fast on the terminal iteration: the flow stops after this
+        # pass either way, so a regenerated solution would never be
+        # executed — don't pay the LLM call for it.
+        if inputs["iteration_count"] >= inputs["max_iterations"]:
+            return inputs
+
+        # The analyser may have volunteered the fixed code alongside its
+        # verdict; consuming it here saves the dedicated regen round trip.
+        # The flag tells post() to hand the fix straight to the executor
+        # instead of the "regen" path, where ParseProblemNode would
+        # overwrite it with a fresh parse before it ever ran.
+        prefetched_fix = inputs.pop("prefetched_fix", "")
+        if prefetched_fix:
+            inputs["python3_code"] = prefetched_fix
+            inputs["full_text"] = inputs["analyse_result"]
+            inputs["fix_pending"] = True
             return inputs
 
         # 构造临时脚本文件
@@ -80,14 +108,18 @@ class CodeRegenNode(Node):
             String indicating the next action for the flow
         """
 
-        if not re.search("\\\\box{是}", exec_res["analyse_result"]):
+        if not exec_res["solved"]:
+            # The cap has to gate the regen branch, otherwise an unsolved
+            # problem loops forever.
+            if shared["iteration_count"] >= shared["max_iterations"]:
+                self.logger.info(f"已达到最大迭代次数{shared['max_iterations']}，未生成符合要求的代码")
+                return "default"
+            if exec_res.pop("fix_pending", False):
+                self.logger.info(f"解题错误，直接执行分析师给出的修复代码！！！")
+                return "exec"
             self.logger.info(f"解题错误，正在进行代码重构！！！")
             return "regen"
 
-        if shared["iteration_count"] == shared["max_iterations"]:
-            self.logger.info(f"已达到最大迭代次数{shared['max_iterations']}，未生成符合要求的代码")
-            return "default"
-
         # Update shared state with parsed problem data
         for k,v in exec_res.items():
             if k not in shared:
@@ -96,6 +128,23 @@ class CodeRegenNode(Node):
         # Always proceed to solution design
         return "default"
     
+    def _build_prompt(self, shared: Dict[str, Any]):
+        """
+        Build the (cacheable prefix, dynamic prompt) pair for a regen call.
+
+        The instructions plus the problem description are identical on
+        every regen iteration for a problem; they form the cacheable
+        prefix, and only the per-iteration fields go into the prompt.
+        """
+        prompt_template = load_prompt("code_regen.txt")
+        prefix_template, sep, dynamic_part = prompt_template.partition("代码解题家实现代码：")
+        cached_prefix = prefix_template.format(shared["problem_desc"])
+
+        prompt = (sep + dynamic_part).format(shared["python3_code"],
+                                             shared["test_result"],
+                                             shared["analyse_result"])
+        return cached_prefix, prompt
+
     def regen_python3_code(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse a direct problem description using LLM.
@@ -106,28 +155,30 @@ class CodeRegenNode(Node):
         Returns:
             Dictionary with parsed problem data
         """
-        # Read the problem analysis prompt
-        prompt_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                  "prompts", "code_regen.txt")
-        
-        with open(prompt_file, 'r') as f:
-            prompt_template = f.read()
-        
-        # Format the prompt with the problem description
-        problem_desc = shared["problem_desc"]
-        python3_code = shared["python3_code"]
+        cached_prefix, prompt = self._build_prompt(shared)
 
-        test_result = shared["test_result"]
-        analyse = shared["analyse_result"]
-        prompt = prompt_template.format(problem_desc, python3_code, test_result, analyse)
-        
         # Generate structured response using LLM
-        self.logger.info(f"代码重构师使用的prompt: {prompt}")
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"代码重构师使用的prompt: {prompt}")
+
+        # Structurally similar failures (same failing code, tests and
+        # analysis) reuse the previous fix instead of a new LLM call.
+        # Keyed on the dynamic prompt only: the shared instructions +
+        # problem-description prefix would dominate the embedding and
+        # make every failure of one problem look like every other.
+        cache = get_semantic_cache()
+        response = cache.lookup(prompt)
+        if response is not None:
+            return response
 
         response = self.llm_client.generate_structured_response(
             prompt,
-            output_format="python3"
+            output_format="python3",
+            cached_prefix=cached_prefix
         )
+        response = {**_RESPONSE_DEFAULTS, **response}
+        cache.insert(prompt, response)
         
-        self.logger.info(f"代码重构师：{response}")
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"代码重构师：{response}")
         return response
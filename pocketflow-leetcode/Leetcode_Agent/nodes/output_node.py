@@ -0,0 +1,139 @@
+"""
+Output Node for LeetCode Agent
+
+This node renders the final solving result (code, test output, analysis)
+as one formatted report at the end of the flow.
+"""
+
+import io
+import sys
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any
+
+from pocketflow import Node
+from Leetcode_Agent.utils.logger import get_logger
+
+# Fields that feed the report; they double as the memoization key.
+_REPORT_FIELDS = ("problem_slug", "iteration_count", "max_iterations",
+                  "python3_code", "test_result", "analyse_result")
+
+
+class OutputNode(Node):
+    """
+    Node for formatting and presenting the final result.
+    """
+
+    # Rendering is a pure function of the report fields, so identical
+    # state reuses the previous render instead of reformatting.
+    _render_cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _RENDER_CACHE_SIZE = 16
+
+    def __init__(self, llm_client=None):
+        """
+        Initialize the OutputNode.
+
+        Args:
+            llm_client: LLM client instance (not used in this node)
+        """
+        super().__init__()
+        self.llm_client = llm_client
+        self.logger = get_logger(self.__class__.__name__)
+
+    @staticmethod
+    def _emit(report: str):
+        """
+        Write the report straight to stdout.
+
+        The report is a single multi-KB string already ending in a
+        newline; sys.stdout.write skips print's argument handling and
+        separate newline write, leaving one buffered write call.
+        """
+        sys.stdout.write(report)
+
+    def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prepare the input for processing.
+
+        Args:
+            shared: Shared state dictionary
+
+        Returns:
+            Dictionary with prepared input data
+        """
+        return shared
+
+    def exec(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render the final report.
+
+        A single StringIO buffer with a bound write reference keeps the
+        formatting pass to one growing buffer instead of a list of many
+        small strings.
+
+        Args:
+            inputs: Prepared input data
+
+        Returns:
+            Dictionary with the formatted output added
+        """
+        cache_key = None
+        if inputs.get("cache_output", True):
+            cache_key = hashlib.blake2b(
+                repr(tuple(inputs.get(k) for k in _REPORT_FIELDS)).encode(),
+                digest_size=16
+            ).digest()
+            cached = OutputNode._render_cache.get(cache_key)
+            if cached is not None:
+                OutputNode._render_cache.move_to_end(cache_key)
+                self._emit(cached)
+                inputs["formatted_output"] = cached
+                return inputs
+
+        buf = io.StringIO()
+        w = buf.write
+
+        w("=" * 60)
+        w("\n")
+        w(f"题目：{inputs.get('problem_slug', '')}\n")
+        w(f"迭代次数：{inputs.get('iteration_count', 0)}/{inputs.get('max_iterations', 0)}\n")
+        w("-" * 60)
+        w("\n最终代码：\n")
+        w(inputs.get("python3_code", ""))
+        w("\n")
+        w("-" * 60)
+        w("\n运行结果：\n")
+        w(inputs.get("test_result", ""))
+        w("\n")
+        w("-" * 60)
+        w("\n分析结论：\n")
+        w(inputs.get("analyse_result", ""))
+        w("\n")
+        w("=" * 60)
+        w("\n")
+
+        formatted_output = buf.getvalue()
+        if cache_key is not None:
+            OutputNode._render_cache[cache_key] = formatted_output
+            if len(OutputNode._render_cache) > OutputNode._RENDER_CACHE_SIZE:
+                OutputNode._render_cache.popitem(last=False)
+        self._emit(formatted_output)
+
+        inputs["formatted_output"] = formatted_output
+        return inputs
+
+    def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, Any]) -> str:
+        """
+        Update the shared state with the formatted output.
+
+        Args:
+            shared: Shared state dictionary
+            prep_res: Result from prep method
+            exec_res: Result from exec method
+
+        Returns:
+            String indicating the next action for the flow
+        """
+        shared["formatted_output"] = exec_res.get("formatted_output", "")
+
+        return "default"
@@ -4,14 +4,20 @@ Parse Problem Node for LeetCode Agent
 This node parses problem content from URLs or direct descriptions.
 """
 
-import os
-import sys
-import traceback
+import asyncio
+import logging
 from typing import Dict, Any
 
 from pocketflow import Node
 from Leetcode_Agent.utils.llm_client import LLMClient
 from Leetcode_Agent.utils.logger import get_logger
+from Leetcode_Agent.utils.semantic_cache import get_semantic_cache
+from Leetcode_Agent.nodes._prompts import load_prompt
+
+
+# Fields downstream nodes rely on; merged under the LLM response in one
+# pass instead of per-key existence checks.
+_RESPONSE_DEFAULTS = {"full_text": "", "python3_code": ""}
 
 
 class ParseProblemNode(Node):
@@ -43,10 +49,11 @@ class ParseProblemNode(Node):
         # Get problem input and input type from shared state
         problem_desc = shared.get("problem_desc", "")
         function_desc = shared.get("function_desc", "")
-        
+
         return {
             "problem_desc": problem_desc,
-            "function_desc": function_desc
+            "function_desc": function_desc,
+            "iteration_count": shared.get("iteration_count", 0)
         }
     
     def exec(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -62,11 +69,69 @@ class ParseProblemNode(Node):
         problem_desc = inputs.get("problem_desc", "")
         function_desc = inputs.get("function_desc", "")
 
-        output = self._parse_direct_description(problem_desc, function_desc)
-                
+        output = self._parse_direct_description(problem_desc, function_desc,
+                                                inputs.get("iteration_count", 0))
+
         return output
 
-    
+    async def aexec(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of exec, so batched problems can overlap their
+        LLM round trips via asyncio.gather.
+
+        Args:
+            inputs: Prepared input data
+
+        Returns:
+            Dictionary with parsed problem data
+        """
+        problem_desc = inputs.get("problem_desc", "")
+        function_desc = inputs.get("function_desc", "")
+
+        static_prefix, prompt = self._build_prompt(problem_desc, function_desc)
+
+        # First pass only — see _parse_direct_description.
+        cache = get_semantic_cache() if inputs.get("iteration_count", 0) == 0 else None
+        if cache is not None:
+            response = cache.lookup(prompt)
+            if response is not None:
+                return response
+
+        response = await self.llm_client.agenerate_structured_response(
+            prompt=prompt,
+            output_format="python3",
+            cached_prefix=static_prefix
+        )
+        response = {**_RESPONSE_DEFAULTS, **response}
+        if cache is not None:
+            cache.insert(prompt, response)
+
+        return response
+
+    async def parse_many(self, problem_inputs, max_concurrency: int = 10):
+        """
+        Parse a batch of problems concurrently.
+
+        Wall time drops from the sum of the per-problem LLM latencies to
+        roughly the slowest one; the semaphore caps in-flight requests so
+        a large batch cannot flood the LLM server.
+
+        Args:
+            problem_inputs: Prepared input dicts, one per problem
+            max_concurrency: Maximum number of in-flight LLM calls
+
+        Returns:
+            Parsed response dicts, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(inputs):
+            async with semaphore:
+                return await self.aexec(inputs)
+
+        return await asyncio.gather(*(_one(inputs) for inputs in problem_inputs))
+
+
     def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, Any]) -> str:
         """
         Update the shared state with the parsed problem data.
@@ -86,34 +151,58 @@ class ParseProblemNode(Node):
         # Always proceed to solution design
         return "default"
     
-    def _parse_direct_description(self, description: str, function_desc: str) -> Dict[str, Any]:
+    def _build_prompt(self, description: str, function_desc: str):
+        """
+        Build the (cacheable prefix, dynamic prompt) pair for a problem.
+
+        The template's static instruction prefix is split off so it can be
+        prompt-cached on the provider side across feedback-loop iterations.
+        """
+        prompt_template = load_prompt("problem_analysis.txt")
+        static_prefix, sep, dynamic_part = prompt_template.partition("LeetCode问题：")
+        prompt = (sep + dynamic_part).format(description, function_desc)
+        return static_prefix, prompt
+
+    def _parse_direct_description(self, description: str, function_desc: str,
+                                  iteration_count: int = 0) -> Dict[str, Any]:
         """
         Parse a direct problem description using LLM.
-        
+
         Args:
             description: Direct problem description
-            
+            iteration_count: Feedback-loop iteration this parse belongs to
+
         Returns:
             Dictionary with parsed problem data
         """
-        # Read the problem analysis prompt
-        prompt_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                  "prompts", "problem_analysis.txt")
-        
-        with open(prompt_file, 'r') as f:
-            prompt_template = f.read()
-        
-        # Format the prompt with the problem description
-        prompt = prompt_template.format(description, function_desc)
-        
-        self.logger.info(f"代码解题师使用的prompt: {prompt}")
+        static_prefix, prompt = self._build_prompt(description, function_desc)
+
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"代码解题师使用的prompt: {prompt}")
+
+        # Semantically identical problems (reworded statements included)
+        # reuse the previous parse instead of paying an LLM round trip —
+        # but only on the first pass. The prompt is invariant across
+        # feedback iterations, so on a regen pass an exact-match hit
+        # would just replay the solution that already failed.
+        cache = get_semantic_cache() if iteration_count == 0 else None
+        if cache is not None:
+            response = cache.lookup(prompt)
+            if response is not None:
+                return response
 
-        # Generate structured response using LLM
-        response = self.llm_client.generate_structured_response(
+        # Stream the response so generation stops as soon as the code
+        # fence closes instead of waiting for the full completion.
+        response = self.llm_client.stream_structured_response(
             prompt=prompt,
-            output_format="python3"
+            output_format="python3",
+            cached_prefix=static_prefix
         )
+        response = {**_RESPONSE_DEFAULTS, **response}
+        if cache is not None:
+            cache.insert(prompt, response)
         
-        self.logger.info(f"代码：{response["python3_code"]}")
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"代码：{response["python3_code"]}")
         
         return response
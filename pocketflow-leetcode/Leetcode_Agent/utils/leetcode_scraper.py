@@ -1,9 +1,83 @@
-import os
 import re
 import time
-import json
+import atexit
+import logging
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from Leetcode_Agent.utils.logger import get_logger
+
+logger = get_logger("leetcode_api")
+
+_SLUG_RE = re.compile(r'/problems/([^/]+)/')
+
+
+def _json(response):
+    """Deserialize a response body, via orjson when available (2-5x faster)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# bs4 (and its parser probe) costs a noticeable chunk of import time
+# but is only needed on the statement-fetch path, so it is loaded on
+# first use rather than at module import.
+_soup_factory = None
+
+
+def _make_soup(html):
+    """Parse html with bs4, importing it and probing for a parser once.
+
+    lxml is a C-backed parser several times faster than the stdlib
+    "html.parser"; fall back gracefully when it is not installed.
+    """
+    global _soup_factory
+    if _soup_factory is None:
+        from bs4 import BeautifulSoup
+        try:
+            BeautifulSoup("", "lxml")
+            parser = "lxml"
+        except Exception:
+            parser = "html.parser"
+        _soup_factory = lambda content: BeautifulSoup(content, parser)
+    return _soup_factory(html)
+
+# GraphQL queries are static; keep them as module constants instead of
+# re-building (and re-serializing) them on every call.
+_Q_CONTENT = """query questionContent($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    content
+    mysqlSchemas
+  }
+}"""
+
+_Q_EDITOR = """query questionEditorData($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    questionId
+    questionFrontendId
+    codeSnippets {
+      lang
+      langSlug
+      code
+    }
+    envInfo
+    enableRunCode
+  }
+}"""
+
+# questionId and exampleTestcaseList are needed together on the run/
+# submit path; one fused query costs a single round trip per slug.
+_Q_META = """query consolePanelConfig($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    questionId
+    exampleTestcaseList
+  }
+}"""
 
 class LeetCodeAPI:
     def __init__(self, cookie: str, csrftoken: str):
@@ -11,235 +85,235 @@ class LeetCodeAPI:
         self.csrftoken = csrftoken
         self.base_url = "https://leetcode.com"
         self.graphql_url = f"{self.base_url}/graphql/"
-
-    def _get_headers(self):
-        headers = {
+        # One session for all calls: default headers live here instead of
+        # being rebuilt per request, and connections are kept alive.
+        self.session = requests.Session()
+        self.session.headers.update({
             'Content-Type': 'application/json',
-            'Cookie': self.cookie
+            'Cookie': cookie
+        })
+        # Retry transient judge/rate-limit failures with backoff, and cap
+        # connect/read so one slow RTT cannot wedge the whole pipeline.
+        adapter = HTTPAdapter(
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[429, 502, 503, 504]),
+            pool_connections=4, pool_maxsize=8
+        )
+        self.session.mount('https://', adapter)
+        self.timeout = (3.05, 10)
+        # Extra headers required by the mutation endpoints
+        # (interpret_solution/submit); only the Referer varies per call.
+        self._mutation_headers = {
+            'x-csrftoken': csrftoken,
+            'Origin': self.base_url
         }
-        print("Generated headers:", headers)
-        return headers
+        # Per-slug caches: problem metadata, statement text and code
+        # templates are immutable on LeetCode, so one fetch per slug (or
+        # per slug+language) covers a whole run.
+        self._meta_cache = {}
+        self._content_cache = {}
+        self._template_cache = {}
+        # Callers that don't use the context manager still get their
+        # keep-alive connections released at interpreter shutdown.
+        atexit.register(self.close)
+
+    def close(self):
+        """Release the session's pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def reset_cache(self):
+        """Clear the per-slug caches (not needed mid-run)."""
+        self._meta_cache.clear()
+        self._content_cache.clear()
+        self._template_cache.clear()
+
+    def _wait_for_result(self, check_url, headers, poll_interval=0.2, timeout=60):
+        """
+        Poll the judge's check endpoint until it reports a terminal state.
+
+        The judge marks an interpretation/submission as done with
+        state == "SUCCESS"; until then it answers "PENDING"/"STARTED".
+        The delay starts at poll_interval and doubles up to 3.2s, so a
+        sub-second verdict is picked up almost immediately while a slow
+        one does not hammer the endpoint.
+        """
+        deadline = time.time() + timeout
+        delay = poll_interval
+        while True:
+            response = self.session.get(check_url, headers=headers, timeout=self.timeout)
+            logger.debug(f"Result check response status: {response.status_code}")
+            response.raise_for_status()
+            result = _json(response)
+            if result.get('state') == 'SUCCESS':
+                return result
+            if time.time() >= deadline:
+                logger.warning(f"Timed out waiting for judge result at {check_url}")
+                return result
+            time.sleep(delay)
+            delay = min(delay * 2, 3.2)
 
     def fetch_problem_plain_text(self, link):
-        match = re.search(r'/problems/([^/]+)/', link)
+        match = _SLUG_RE.search(link)
         if not match:
             raise ValueError("Invalid LeetCode problem URL")
         slug = match.group(1)
-        print(f"Extracted slug: {slug}")
-
-        payload = json.dumps({
-            "query": """query questionContent($titleSlug: String!) {
-      question(titleSlug: $titleSlug) {
-        content
-        mysqlSchemas
-      }
-    }""",
-            "variables": {"titleSlug": slug}
-        })
-        print("Payload for plain text fetch:", payload)
+        logger.debug(f"Extracted slug: {slug}")
+
+        if slug in self._content_cache:
+            return self._content_cache[slug]
 
         try:
-            print(f"Fetching problem: {slug}")
-            response = requests.post(self.graphql_url, headers=self._get_headers(), data=payload)
-            print("Response status:", response.status_code)
+            logger.debug(f"Fetching problem: {slug}")
+            response = self.session.post(self.graphql_url,
+                                         json={"query": _Q_CONTENT, "variables": {"titleSlug": slug}},
+                                         timeout=self.timeout)
+            logger.debug(f"Response status: {response.status_code}")
             response.raise_for_status()
 
-            response_json = response.json()
-            print("Response JSON keys:", list(response_json.keys()))
+            response_json = _json(response)
             html_content = response_json.get('data', {}).get('question', {}).get('content', '')
             if not html_content:
-                print("No content found for problem.")
+                logger.warning("No content found for problem.")
                 return "", slug
-            
-            print(html_content)
-            soup = BeautifulSoup(html_content, "html.parser")
-            print("Successfully fetched problem text.")
-            return soup.get_text(), slug
+
+            soup = _make_soup(html_content)
+            logger.debug("Successfully fetched problem text.")
+            self._content_cache[slug] = (soup.get_text(), slug)
+            return self._content_cache[slug]
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching problem plain text: {e}")
+            logger.error(f"Error fetching problem plain text: {e}")
             raise
 
     def generate_template(self, problem_slug, code_lang):
-        payload = json.dumps({
-            "query": """
-                query questionEditorData($titleSlug: String!) {
-                  question(titleSlug: $titleSlug) {
-                    questionId
-                    questionFrontendId
-                    codeSnippets {
-                      lang
-                      langSlug
-                      code
-                    }
-                    envInfo
-                    enableRunCode
-                  }
-                }
-            """,
-            "variables": {
-                "titleSlug": problem_slug
-            }
-        })
-        print("Payload for code template:", payload)
-
+        if (problem_slug, code_lang) in self._template_cache:
+            return self._template_cache[(problem_slug, code_lang)]
         try:
-            print(f"Generating template for {problem_slug} in {code_lang}")
-            response = requests.post(self.graphql_url, headers=self._get_headers(), data=payload)
-            print("Response status:", response.status_code)
+            logger.debug(f"Generating template for {problem_slug} in {code_lang}")
+            response = self.session.post(self.graphql_url,
+                                         json={"query": _Q_EDITOR, "variables": {"titleSlug": problem_slug}},
+                                         timeout=self.timeout)
+            logger.debug(f"Response status: {response.status_code}")
             response.raise_for_status()
-            data = response.json()
-            print("Code snippet languages available:", [s["langSlug"] for s in data['data']['question']['codeSnippets']])
+            data = _json(response)
+            if logger.logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Code snippet languages available: {[s['langSlug'] for s in data['data']['question']['codeSnippets']]}")
 
             code_snippets = data['data']['question']['codeSnippets']
             matched_snippet = next((s for s in code_snippets if s['langSlug'] == code_lang), None)
             if matched_snippet:
-                print("Successfully generated template.")
+                logger.debug("Successfully generated template.")
+                self._template_cache[(problem_slug, code_lang)] = matched_snippet['code']
                 return matched_snippet['code']
             else:
-                print(f"No template found for language: {code_lang}")
+                logger.warning(f"No template found for language: {code_lang}")
                 return f"No code found for language: {code_lang}"
         except (requests.exceptions.RequestException, KeyError) as e:
-            print(f"Error generating template: {e}")
+            logger.error(f"Error generating template: {e}")
             return f"Error fetching code: {e}"
 
     def run_code(self, problem_slug, code_lang, code):
         try:
-            print(f"Running code for {problem_slug}")
+            logger.debug(f"Running code for {problem_slug}")
             question_id = self._get_question_id(problem_slug)
             url = f"{self.base_url}/problems/{problem_slug}/interpret_solution/"
 
             test_cases = self._get_example_test_cases(problem_slug)
-            print("Test cases used for run:", test_cases)
+            logger.debug(f"Test cases used for run: {test_cases}")
 
-            payload = json.dumps({
+            payload = {
                 "lang": code_lang,
                 "question_id": question_id,
                 "typed_code": code,
                 "data_input": "\n".join(test_cases)
-            })
-            print("Payload for running code:", payload)
+            }
 
-            headers = self._get_headers()
-            headers['x-csrftoken'] = self.csrftoken
-            headers['Origin'] = self.base_url
-            headers['Referer'] = f"{self.base_url}/problems/{problem_slug}"
-            print("Headers for run code request:", headers)
+            headers = {**self._mutation_headers,
+                       'Referer': f"{self.base_url}/problems/{problem_slug}"}
 
-            response = requests.post(url, headers=headers, data=payload)
-            print("Run code response status:", response.status_code)
+            response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+            logger.debug(f"Run code response status: {response.status_code}")
             response.raise_for_status()
-            interpret_id = response.json().get('interpret_id')
-            print(f"Interpretation ID: {interpret_id}")
-
-            print(f"Waiting for result of interpretation {interpret_id}...")
-            time.sleep(4)
+            interpret_id = _json(response).get('interpret_id')
+            logger.debug(f"Interpretation ID: {interpret_id}")
 
+            logger.debug(f"Waiting for result of interpretation {interpret_id}...")
             check_url = f"{self.base_url}/submissions/detail/{interpret_id}/check/"
-            response = requests.get(check_url, headers=headers)
-            print("Result check response status:", response.status_code)
-            response.raise_for_status()
-            print("Successfully ran code.")
-            return response.json()
+            result = self._wait_for_result(check_url, headers)
+            logger.debug("Successfully ran code.")
+            return result
         except (requests.exceptions.RequestException, KeyError) as e:
-            print(f"Error running code: {e}")
+            logger.error(f"Error running code: {e}")
             raise
 
     def submit_code(self, problem_slug, code_lang, code):
         try:
-            print(f"Submitting code for {problem_slug}")
+            logger.debug(f"Submitting code for {problem_slug}")
             question_id = self._get_question_id(problem_slug)
             url = f"{self.base_url}/problems/{problem_slug}/submit/"
 
-            payload = json.dumps({
+            payload = {
                 "lang": code_lang,
                 "question_id": question_id,
                 "typed_code": code
-            })
-            print("Payload for submission:", payload)
+            }
 
-            headers = self._get_headers()
-            headers['x-csrftoken'] = self.csrftoken
-            headers['Origin'] = self.base_url
-            headers['Referer'] = f"{self.base_url}/problems/{problem_slug}"
+            headers = {**self._mutation_headers,
+                       'Referer': f"{self.base_url}/problems/{problem_slug}"}
 
-            response = requests.post(url, headers=headers, data=payload)
-            print("Submit response status:", response.status_code)
+            response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+            logger.debug(f"Submit response status: {response.status_code}")
             response.raise_for_status()
-            submission_id = response.json().get('submission_id')
-            print(f"Submission ID: {submission_id}")
-
-            print(f"Waiting for result of submission {submission_id}...")
-            time.sleep(4)
+            submission_id = _json(response).get('submission_id')
+            logger.debug(f"Submission ID: {submission_id}")
 
+            logger.debug(f"Waiting for result of submission {submission_id}...")
             check_url = f"{self.base_url}/submissions/detail/{submission_id}/check/"
-            response = requests.get(check_url, headers=headers)
-            print("Submission result check status:", response.status_code)
-            response.raise_for_status()
-            print("Successfully submitted code.")
-            return response.json()
+            result = self._wait_for_result(check_url, headers)
+            logger.debug("Successfully submitted code.")
+            return result
         except (requests.exceptions.RequestException, KeyError) as e:
-            print(f"Error submitting code: {e}")
+            logger.error(f"Error submitting code: {e}")
             raise
 
-    def _get_question_id(self, problem_slug):
+    def _get_question_meta(self, problem_slug):
+        """Fetch questionId + exampleTestcaseList in one query, per slug."""
+        if problem_slug in self._meta_cache:
+            return self._meta_cache[problem_slug]
         try:
-            print(f"Fetching question ID for {problem_slug}")
-            payload = json.dumps({
-                "query": '''
-                    query consolePanelConfig($titleSlug: String!) {
-                      question(titleSlug: $titleSlug) {
-                        questionId
-                      }
-                    }
-                ''',
-                "variables": {
-                    "titleSlug": problem_slug
-                }
-            })
-            print("Payload for question ID:", payload)
-            response = requests.post(self.graphql_url, headers=self._get_headers(), data=payload)
-            print("Question ID fetch response status:", response.status_code)
+            logger.debug(f"Fetching question metadata for {problem_slug}")
+            response = self.session.post(self.graphql_url,
+                                         json={"query": _Q_META, "variables": {"titleSlug": problem_slug}},
+                                         timeout=self.timeout)
+            logger.debug(f"Question metadata fetch response status: {response.status_code}")
             response.raise_for_status()
-            question_id = response.json()['data']['question']['questionId']
-            print(f"Successfully fetched question ID: {question_id}")
-            return question_id
+            meta = _json(response)['data']['question']
+            logger.debug(f"Successfully fetched question metadata: {meta}")
+            self._meta_cache[problem_slug] = meta
+            return meta
         except (requests.exceptions.RequestException, KeyError) as e:
-            print(f"Error fetching question ID: {e}")
+            logger.error(f"Error fetching question metadata: {e}")
             raise
 
+    def _get_question_id(self, problem_slug):
+        return self._get_question_meta(problem_slug)['questionId']
+
     def _get_example_test_cases(self, problem_slug):
-        try:
-            print(f"Fetching example test cases for {problem_slug}")
-            payload = json.dumps({
-                "query": '''
-                    query consolePanelConfig($titleSlug: String!) {
-                      question(titleSlug: $titleSlug) {
-                        exampleTestcaseList
-                      }
-                    }
-                ''',
-                "variables": {
-                    "titleSlug": problem_slug
-                }
-            })
-            print("Payload for example test cases:", payload)
-            response = requests.post(self.graphql_url, headers=self._get_headers(), data=payload)
-            print("Example test case fetch response status:", response.status_code)
-            response.raise_for_status()
-            test_cases = response.json()['data']['question']['exampleTestcaseList']
-            print("Successfully fetched example test cases:", test_cases)
-            return test_cases
-        except (requests.exceptions.RequestException, KeyError) as e:
-            print(f"Error fetching example test cases: {e}")
-            raise
+        return self._get_question_meta(problem_slug)['exampleTestcaseList']
 
     def scrape_problem(self, problem_slug):
         try:
-            print(f"Scraping problem {problem_slug}")
-            question_id = self._get_question_id(problem_slug)
-            test_cases = self._get_example_test_cases(problem_slug)
-            print(f"Successfully scraped problem {problem_slug} with question ID {question_id} and test cases {test_cases}")
+            logger.debug(f"Scraping problem {problem_slug}")
+            meta = self._get_question_meta(problem_slug)
+            question_id = meta['questionId']
+            test_cases = meta['exampleTestcaseList']
+            logger.debug(f"Successfully scraped problem {problem_slug} with question ID {question_id} and test cases {test_cases}")
             return question_id, test_cases
         except Exception as e:
-            print(f"Error scraping problem {problem_slug}: {e}")
+            logger.error(f"Error scraping problem {problem_slug}: {e}")
             raise
@@ -0,0 +1,97 @@
+"""
+Disk-Backed LLM Response Cache for LeetCode Agent
+
+This module persists structured LLM responses keyed by an exact request
+hash, so re-running a previously solved problem (even in a new process)
+short-circuits to a sub-millisecond lookup instead of an LLM round trip.
+Entries are JSON files in a cache directory; a small in-memory dict
+fronts the disk so repeat hits within one process never touch the
+filesystem.
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, Optional
+
+from Leetcode_Agent.utils.logger import get_logger
+
+logger = get_logger("llm_cache")
+
+
+class LLMCache:
+    """
+    Exact-match response cache persisted as one JSON file per entry.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached responses
+        """
+        self.enabled = not os.environ.get("LEETCODE_AGENT_NO_LLM_CACHE")
+        self.cache_dir = cache_dir or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "llm_cache")
+        self._memory: Dict[str, Any] = {}
+
+    @staticmethod
+    def make_key(prompt: str, output_format: str, model: str, temperature: float) -> str:
+        """Key a request by everything that can change its response."""
+        payload = f"{model}\x00{output_format}\x00{temperature}\x00{prompt}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached response for key, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        if key in self._memory:
+            return self._memory[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                response = json.load(f)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            return None
+        self._memory[key] = response
+        return response
+
+    def put(self, key: str, response: Any):
+        """
+        Store a response under key, in memory and on disk.
+
+        The disk write goes through a temp file + os.replace so a crash
+        mid-write never leaves a truncated entry behind.
+        """
+        if not self.enabled:
+            return
+        self._memory[key] = response
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(response, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"Failed to persist cache entry {key}: {e}")
+
+
+# Shared across the process so every client sees the same entries.
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLMCache instance."""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
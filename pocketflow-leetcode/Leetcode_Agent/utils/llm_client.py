@@ -5,105 +5,319 @@ This module provides a client for interacting with LLM APIs (OpenAI).
 """
 
 import os
+import re
+import json
+import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 
+import yaml
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import openai
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     raise ImportError("OpenAI package is required. Install with: pip install openai")
 
+from Leetcode_Agent.utils.llm_cache import get_llm_cache
+
+# One pass over the response instead of several find() scans; captures the
+# body of the first fenced code block regardless of its language tag.
+_FENCE_RE = re.compile(r"```(?:yaml|json|python3|python)?\s*(.*?)```", re.DOTALL)
+
 
 class LLMClient:
     """
     Client for interacting with LLM APIs.
     """
-    
-    def __init__(self, model: str = "gpt-3.5-turbo", api_key: Optional[str] = None):
+
+    # Resolved model id from the server, shared across instances so only
+    # the first LLMClient pays the models.list() round trip.
+    _cached_model_id: Optional[str] = None
+
+    # The OpenAI SDK clients each own a persistent httpx connection pool;
+    # sharing them across LLMClient instances keeps TCP/TLS connections
+    # warm between flow runs instead of re-handshaking per instantiation.
+    _shared_client: Optional[OpenAI] = None
+    _shared_async_client: Optional[AsyncOpenAI] = None
+
+    # LRU of deterministic (temperature == 0) completions, keyed by a hash
+    # of the full request, so identical re-asks skip the round trip.
+    _response_cache: "OrderedDict[str, str]" = OrderedDict()
+    _RESPONSE_CACHE_SIZE = 256
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
         """
         Initialize the LLM client.
-        
+
         Args:
-            model: The model to use (default: gpt-3.5-turbo)
+            model: The model to use (if not provided, resolved from the server once)
             api_key: OpenAI API key (if not provided, uses OPENAI_API_KEY env variable)
         """
-        self.model = model
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
-            
-        self.client = OpenAI(api_key="empty", base_url="http://192.168.16.2:18001/v1")
-        self.model = self.client.models.list().data[0].id
-        print(self.model)
+
+        if LLMClient._shared_client is None:
+            LLMClient._shared_client = OpenAI(api_key="empty", base_url="http://192.168.16.2:18001/v1")
+        self.client = LLMClient._shared_client
+        if model:
+            self.model = model
+        else:
+            if LLMClient._cached_model_id is None:
+                LLMClient._cached_model_id = self.client.models.list().data[0].id
+            self.model = LLMClient._cached_model_id
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """The async OpenAI client, created lazily on first use."""
+        if LLMClient._shared_async_client is None:
+            LLMClient._shared_async_client = AsyncOpenAI(api_key="empty", base_url="http://192.168.16.2:18001/v1")
+        return LLMClient._shared_async_client
+
+    def _cache_key(self, messages, temperature, max_tokens, response_format) -> Optional[str]:
+        """Cache key for a request, or None when it must not be memoized."""
+        if temperature != 0:
+            return None
+        return hashlib.blake2b(
+            repr((self.model, messages, temperature, max_tokens, response_format)).encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        cached = LLMClient._response_cache.get(cache_key)
+        if cached is not None:
+            LLMClient._response_cache.move_to_end(cache_key)
+        return cached
+
+    def _cache_put(self, cache_key: Optional[str], content: str):
+        if cache_key is None:
+            return
+        LLMClient._response_cache[cache_key] = content
+        if len(LLMClient._response_cache) > LLMClient._RESPONSE_CACHE_SIZE:
+            LLMClient._response_cache.popitem(last=False)
+
+    def _build_params(self, messages, temperature, max_tokens, response_format) -> Dict[str, Any]:
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+
+        if response_format:
+            params["response_format"] = response_format
+
+        return params
 
     def chat_completion(
-        self, 
-        messages, 
+        self,
+        messages,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generate a chat completion.
-        
+
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum number of tokens to generate
             response_format: Response format (e.g., {"type": "json_object"})
-            
+
         Returns:
             The generated text response
         """
         if isinstance(messages, str):
             messages = [{"role": "user", "content": messages}]
 
-        params = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-        }
-        
-        if max_tokens:
-            params["max_tokens"] = max_tokens
-            
-        if response_format:
-            params["response_format"] = response_format
-        
+        # Only deterministic sampling is safe to memoize.
+        cache_key = self._cache_key(messages, temperature, max_tokens, response_format)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Deterministic completions also survive process restarts via the
+        # disk cache, stored as the raw response string.
+        disk_cache = get_llm_cache()
+        disk_key = None
+        if cache_key is not None:
+            disk_key = disk_cache.make_key(repr(messages), "text", self.model, temperature)
+            content = disk_cache.get(disk_key)
+            if content is not None:
+                self._cache_put(cache_key, content)
+                return content
+
+        params = self._build_params(messages, temperature, max_tokens, response_format)
         response = self.client.chat.completions.create(**params)
-        return response.choices[0].message.content
-    
+        content = response.choices[0].message.content
+
+        self._cache_put(cache_key, content)
+        if disk_key is not None:
+            disk_cache.put(disk_key, content)
+        return content
+
+    async def achat_completion(
+        self,
+        messages,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Async variant of chat_completion, sharing the same response cache.
+        """
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+
+        cache_key = self._cache_key(messages, temperature, max_tokens, response_format)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        disk_cache = get_llm_cache()
+        disk_key = None
+        if cache_key is not None:
+            disk_key = disk_cache.make_key(repr(messages), "text", self.model, temperature)
+            content = disk_cache.get(disk_key)
+            if content is not None:
+                self._cache_put(cache_key, content)
+                return content
+
+        params = self._build_params(messages, temperature, max_tokens, response_format)
+        response = await self.async_client.chat.completions.create(**params)
+        content = response.choices[0].message.content
+
+        self._cache_put(cache_key, content)
+        if disk_key is not None:
+            disk_cache.put(disk_key, content)
+        return content
+
+    def _build_messages(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        cached_prefix: Optional[str],
+        cache_segments: Optional[List] = None
+    ) -> List[Dict[str, Any]]:
+        messages = []
+
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+
+        # cached_prefix is shorthand for a single cacheable segment.
+        if cached_prefix and not cache_segments:
+            cache_segments = [(cached_prefix, True)]
+
+        if cache_segments:
+            # Segments go first and must stay byte-identical across calls;
+            # the cache_control marker on cacheable ones is honored by
+            # providers that support it (Anthropic-style) and ignored by
+            # the rest, where automatic prefix caching still benefits from
+            # the stable head.
+            blocks = []
+            for text, cacheable in cache_segments:
+                block = {"type": "text", "text": text}
+                if cacheable:
+                    block["cache_control"] = {"type": "ephemeral"}
+                blocks.append(block)
+            messages.append({"role": "system", "content": blocks})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _parse_structured(self, response_text: str, output_format: str) -> Dict[str, Any]:
+        """Parse a raw completion into a dict according to output_format."""
+        if output_format.lower() == "python3":
+            # partition does the scan-and-slice in one C call per fence.
+            _, opened, rest = response_text.partition("```python3")
+            if opened:
+                python3_code, closed, _ = rest.partition("```")
+                if closed:
+                    return {
+                        "full_text": response_text,
+                        "python3_code": python3_code.strip(),
+                    }
+        # Parse the response
+        try:
+            if output_format.lower() == "json":
+                # orjson is a few times faster than the stdlib parser;
+                # fall back transparently when it is not installed.
+                if orjson is not None:
+                    return orjson.loads(response_text)
+                return json.loads(response_text)
+            else:  # Default to YAML
+                # Prefer an explicit code fence (the common shape of LLM
+                # output) so malformed surrounding prose never costs a
+                # failed parse + exception round trip.
+                m = _FENCE_RE.search(response_text)
+                payload = m.group(1).strip() if m else response_text
+                return yaml.load(payload, Loader=_YamlLoader)
+        except Exception as e:
+            raise ValueError(f"Failed to parse structured response: {e}\nResponse text: {response_text}")
+
     def generate_structured_response(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         system_message: str = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        output_format: str = "yaml"
+        output_format: str = "yaml",
+        cached_prefix: Optional[str] = None,
+        cache_segments: Optional[List] = None
     ) -> Dict[str, Any]:
         """
         Generate a structured response in YAML or JSON format.
-        
+
         Args:
             prompt: The user prompt
             system_message: Optional system message
             temperature: Sampling temperature
             max_tokens: Maximum number of tokens to generate
             output_format: "yaml" or "json"
-            
+            cached_prefix: Static prompt text that is identical across calls;
+                sent as a leading system block with a cache_control marker so
+                providers with prompt caching skip its prefill and bill it at
+                the cached-token rate
+            cache_segments: Generalization of cached_prefix — (text,
+                cacheable) pairs sent as ordered system blocks, with a
+                cache_control marker on the cacheable ones
+
         Returns:
             Parsed structured data as a dictionary
         """
-        messages = []
-        
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-            
-        messages.append({"role": "user", "content": prompt})
-        
+        # As with chat_completion, only deterministic sampling is safe to
+        # memoize: at temperature > 0 re-asking the same prompt is meant
+        # to produce a different answer (the feedback loop relies on it).
+        disk_cache = get_llm_cache()
+        disk_key = None
+        if temperature == 0:
+            prefix_text = cached_prefix or "".join(t for t, _ in cache_segments or ())
+            disk_key = disk_cache.make_key(prefix_text + prompt,
+                                           output_format, self.model, temperature)
+            cached = disk_cache.get(disk_key)
+            if cached is not None:
+                return cached
+
+        messages = self._build_messages(prompt, system_message, cached_prefix, cache_segments)
+
         # Set response format based on output format
         response_format = None
         if output_format.lower() == "json":
             response_format = {"type": "json_object"}
-        
+
         response_text = self.chat_completion(
             messages=messages,
             temperature=temperature,
@@ -111,44 +325,151 @@ class LLMClient:
             response_format=response_format
         )
 
-        if output_format.lower() == "python3":
-            start = response_text.find("```python3") + len("```python3")
-            end = response_text.find("```", start)
-            if end != -1:
-                python3_code = response_text[start:end].strip()
-                return {
-                    "full_text": response_text,
-                    "python3_code": python3_code,
-                }
-        # Parse the response
+        parsed = self._parse_structured(response_text, output_format)
+        if disk_key is not None:
+            disk_cache.put(disk_key, parsed)
+        return parsed
+
+    def stream_structured_response(
+        self,
+        prompt: str,
+        system_message: str = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        output_format: str = "python3",
+        cached_prefix: Optional[str] = None,
+        cache_segments: Optional[List] = None
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of generate_structured_response.
+
+        Tokens are consumed as they arrive and the stream is closed as
+        soon as the first fenced code block closes, so a completion that
+        rambles after the code never costs generation time. Falls back
+        to whatever arrived if the model never closes a fence.
+        """
+        # Deterministic requests only — see generate_structured_response.
+        disk_cache = get_llm_cache()
+        disk_key = None
+        if temperature == 0:
+            prefix_text = cached_prefix or "".join(t for t, _ in cache_segments or ())
+            disk_key = disk_cache.make_key(prefix_text + prompt,
+                                           output_format, self.model, temperature)
+            disk_cached = disk_cache.get(disk_key)
+            if disk_cached is not None:
+                return disk_cached
+
+        messages = self._build_messages(prompt, system_message, cached_prefix, cache_segments)
+
+        cache_key = self._cache_key(messages, temperature, max_tokens, None)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._parse_structured(cached, output_format)
+
+        params = self._build_params(messages, temperature, max_tokens, None)
+        stream = self.client.chat.completions.create(stream=True, **params)
+
+        json_mode = output_format.lower() == "json"
+        decoder = json.JSONDecoder()
+        parsed = None
+        parts = []
+        fences = 0
+        carry = ""
         try:
-            if output_format.lower() == "json":
-                import json
-                return json.loads(response_text)
-            else:  # Default to YAML
-                import yaml
-                
-                # Try to parse as-is first
-                try:
-                    return yaml.safe_load(response_text)
-                except:
-                    # If that fails, try to extract YAML content from code blocks
-                    if "```yaml" in response_text:
-                        # Extract content between ```yaml and ```
-                        start = response_text.find("```yaml") + 7
-                        end = response_text.find("```", start)
-                        if end != -1:
-                            yaml_content = response_text[start:end].strip()
-                            return yaml.safe_load(yaml_content)
-                    elif "```" in response_text:
-                        # Extract content between first ``` and next ```
-                        start = response_text.find("```") + 3
-                        end = response_text.find("```", start)
-                        if end != -1:
-                            content = response_text[start:end].strip()
-                            return yaml.safe_load(content)
-                    
-                    # If all else fails, raise the original exception
-                    raise
-        except Exception as e:
-            raise ValueError(f"Failed to parse structured response: {e}\nResponse text: {response_text}")
\ No newline at end of file
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                if json_mode:
+                    # Try a decode only when a brace just closed; as soon
+                    # as a complete top-level object parses, stop reading.
+                    if "}" not in delta:
+                        continue
+                    text = "".join(parts)
+                    start = text.find("{")
+                    if start == -1:
+                        continue
+                    try:
+                        parsed, _ = decoder.raw_decode(text, start)
+                    except ValueError:
+                        continue
+                    break
+                # Count fences over a 2-char carry so a ``` split across
+                # chunks is still seen, without rescanning the whole text.
+                window = carry + delta
+                fences += window.count("```") - carry.count("```")
+                carry = window[-2:]
+                if fences >= 2:
+                    break
+        finally:
+            stream.close()
+
+        if parsed is None:
+            response_text = "".join(parts)
+            self._cache_put(cache_key, response_text)
+            parsed = self._parse_structured(response_text, output_format)
+        if disk_key is not None:
+            disk_cache.put(disk_key, parsed)
+        return parsed
+
+    async def agenerate_structured_response(
+        self,
+        prompt: str,
+        system_message: str = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        output_format: str = "yaml",
+        cached_prefix: Optional[str] = None,
+        cache_segments: Optional[List] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate_structured_response, so batched problems
+        can overlap their LLM round trips via asyncio.gather.
+        """
+        # Deterministic requests only — see generate_structured_response.
+        disk_cache = get_llm_cache()
+        disk_key = None
+        if temperature == 0:
+            prefix_text = cached_prefix or "".join(t for t, _ in cache_segments or ())
+            disk_key = disk_cache.make_key(prefix_text + prompt,
+                                           output_format, self.model, temperature)
+            cached = disk_cache.get(disk_key)
+            if cached is not None:
+                return cached
+
+        messages = self._build_messages(prompt, system_message, cached_prefix, cache_segments)
+
+        response_format = None
+        if output_format.lower() == "json":
+            response_format = {"type": "json_object"}
+
+        response_text = await self.achat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        )
+
+        parsed = self._parse_structured(response_text, output_format)
+        if disk_key is not None:
+            disk_cache.put(disk_key, parsed)
+        return parsed
+
+
+_default_client: Optional[LLMClient] = None
+
+
+def get_default_llm_client() -> LLMClient:
+    """The process-wide shared LLMClient, created on first use.
+
+    Preferred over constructing LLMClient directly when no custom model
+    or key is needed: every caller shares one client (and its resolved
+    model id) instead of each flow build paying its own construction.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient()
+    return _default_client
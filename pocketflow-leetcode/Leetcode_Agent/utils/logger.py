@@ -4,102 +4,136 @@ Logging utilities for LeetCode Agent
 This module provides logging functionality for the LeetCode agent.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 
 class LeetCodeLogger:
     """
     Logger class for LeetCode Agent with detailed error reporting.
+
+    Constructing the same name twice returns the same instance, and all
+    named loggers in a run share one timestamped log file, so direct
+    construction (as in flow.py) no longer fans out files/handlers.
     """
-    
+
+    _instances: Dict[str, "LeetCodeLogger"] = {}
+    _log_file: Optional[str] = None
+
+    def __new__(cls, name: str = "leetcode_agent", log_level: str = "INFO"):
+        instance = cls._instances.get(name)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instances[name] = instance
+        return instance
+
     def __init__(self, name: str = "leetcode_agent", log_level: str = "INFO"):
         """
         Initialize the logger.
-        
+
         Args:
             name: Logger name
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         """
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+
+        # LEETCODE_AGENT_DEBUG must lower the logger level too, not just
+        # the file handler's: records are filtered at the logger before
+        # they ever reach the QueueHandler, so a DEBUG handler behind an
+        # INFO logger never sees anything (and isEnabledFor(DEBUG) stays
+        # False, keeping the debug-gated payload dumps skipped).
+        debug_enabled = bool(os.environ.get("LEETCODE_AGENT_DEBUG"))
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, log_level.upper()))
-        
+        self.logger.setLevel(logging.DEBUG if debug_enabled
+                             else getattr(logging, log_level.upper()))
+
         # Create logs directory if it doesn't exist
         log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
         os.makedirs(log_dir, exist_ok=True)
-        
-        # Create file handler with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"leetcode_agent_{timestamp}.log")
-        
-        # Create file handler
+
+        # One timestamped log file per run, shared by every named logger
+        if LeetCodeLogger._log_file is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            LeetCodeLogger._log_file = os.path.join(log_dir, f"leetcode_agent_{timestamp}.log")
+        log_file = LeetCodeLogger._log_file
+
+        # Create file handler; capture DEBUG only when explicitly asked for,
+        # so payload dumps stay out of the log by default.
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Create console handler
+        file_handler.setLevel(logging.DEBUG if debug_enabled else logging.INFO)
+
+        # Create console handler; debug dumps go to the file only.
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        
+
         # Create formatter with stack info to show actual caller
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(pathname)s:%(lineno)d - %(funcName)s() - %(message)s'
         )
-        
+
         # Add formatter to handlers
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
+
+        # Emit through a queue so callers never block on file/console I/O;
+        # a background listener thread drains it to the real handlers.
         if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            self._queue = queue.Queue(-1)
+            self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+            self._listener = logging.handlers.QueueListener(
+                self._queue, file_handler, console_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            atexit.register(self._listener.stop)
     
-    def debug(self, message: str, exc_info: bool = False):
+    # The wrappers forward %-style args so callers can defer formatting
+    # (logger.debug("sig: %s", sig)) — the message is only interpolated
+    # when a handler actually consumes the record.
+
+    def debug(self, message: str, *args, exc_info: bool = False):
         """Log debug message."""
-        self.logger.debug(message, exc_info=exc_info, stacklevel=2)
-    
-    def info(self, message: str, exc_info: bool = False):
+        self.logger.debug(message, *args, exc_info=exc_info, stacklevel=2)
+
+    def info(self, message: str, *args, exc_info: bool = False):
         """Log info message."""
-        self.logger.info(message, exc_info=exc_info, stacklevel=2)
-    
-    def warning(self, message: str, exc_info: bool = False):
+        self.logger.info(message, *args, exc_info=exc_info, stacklevel=2)
+
+    def warning(self, message: str, *args, exc_info: bool = False):
         """Log warning message."""
-        self.logger.warning(message, exc_info=exc_info, stacklevel=2)
-    
-    def error(self, message: str, exc_info: bool = True):
+        self.logger.warning(message, *args, exc_info=exc_info, stacklevel=2)
+
+    def error(self, message: str, *args, exc_info: bool = True):
         """Log error message with exception info by default."""
-        self.logger.error(message, exc_info=exc_info, stacklevel=2)
-    
-    def critical(self, message: str, exc_info: bool = True):
+        self.logger.error(message, *args, exc_info=exc_info, stacklevel=2)
+
+    def critical(self, message: str, *args, exc_info: bool = True):
         """Log critical message with exception info by default."""
-        self.logger.critical(message, exc_info=exc_info, stacklevel=2)
+        self.logger.critical(message, *args, exc_info=exc_info, stacklevel=2)
     
     def exception(self, message: str):
         """Log exception with traceback."""
         self.logger.exception(message, stacklevel=2)
 
 
-# Global logger instance
-_logger = None
-
-
 def get_logger(name: Optional[str] = None) -> LeetCodeLogger:
     """
-    Get the logger instance.
-    
+    Get the logger instance for a name (one instance per name).
+
     Args:
         name: Optional logger name
-        
+
     Returns:
         Logger instance
     """
-    global _logger
-    if _logger is None:
-        _logger = LeetCodeLogger(name or "leetcode_agent")
-    return _logger
+    return LeetCodeLogger(name or "leetcode_agent")
 
 
 def log_function_call(func):
@@ -114,10 +148,15 @@ def log_function_call(func):
     """
     def wrapper(*args, **kwargs):
         logger = get_logger()
-        logger.debug(f"Calling function {func.__name__} with args={args}, kwargs={kwargs}")
+        # Only build the (potentially huge) args/kwargs repr when a DEBUG
+        # handler will actually consume it.
+        debug_enabled = logger.logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(f"Calling function {func.__name__} with args={args}, kwargs={kwargs}")
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"Function {func.__name__} completed successfully")
+            if debug_enabled:
+                logger.debug(f"Function {func.__name__} completed successfully")
             return result
         except Exception as e:
             logger.error(f"Function {func.__name__} failed with error: {str(e)}")
@@ -135,8 +174,9 @@ def log_method_call(cls):
     Returns:
         Decorated class
     """
-    for attr_name in dir(cls):
-        attr = getattr(cls, attr_name)
+    # Iterate cls.__dict__ rather than dir(cls) so inherited object/base
+    # methods are not wrapped as well.
+    for attr_name, attr in list(cls.__dict__.items()):
         if callable(attr) and not attr_name.startswith('_'):
             setattr(cls, attr_name, log_function_call(attr))
     return cls
\ No newline at end of file
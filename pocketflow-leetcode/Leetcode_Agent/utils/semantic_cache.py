@@ -0,0 +1,128 @@
+"""
+Semantic Response Cache for LeetCode Agent
+
+This module caches structured LLM responses keyed by prompt embeddings, so
+prompts that are semantically identical to a previously answered one skip
+the LLM call entirely. Requires faiss and sentence-transformers; when they
+are not installed the cache silently disables itself.
+"""
+
+import os
+import re
+import pickle
+from typing import Any, Dict, Optional
+
+from Leetcode_Agent.utils.logger import get_logger
+
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    _DEPS_AVAILABLE = True
+except ImportError:
+    _DEPS_AVAILABLE = False
+
+logger = get_logger("semantic_cache")
+
+_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Collapses runs of whitespace so reworded-but-equivalent prompts that
+# differ only in formatting embed to the same point.
+_WS_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    """Case-fold and collapse whitespace before embedding."""
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+class SemanticCache:
+    """
+    FAISS-backed cache mapping prompt embeddings to stored responses.
+
+    Responses are kept in a list parallel to the vectors in the index and
+    persisted to disk, so repeated/near-duplicate problems across runs hit
+    in milliseconds instead of paying an LLM round trip.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, threshold: float = 0.97):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_file: Path of the pickle file used for persistence
+            threshold: Minimum cosine similarity for a lookup to count as a hit
+        """
+        self.threshold = threshold
+        self.enabled = _DEPS_AVAILABLE and not os.environ.get("LEETCODE_AGENT_NO_SEMANTIC_CACHE")
+        self.cache_file = cache_file or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "semantic_cache.pkl")
+        self._model = None
+        self._index = None
+        self._responses = []
+        if not self.enabled:
+            logger.debug("Semantic cache disabled (missing deps or env flag).")
+
+    def _ensure_loaded(self):
+        """Load the embedding model and any persisted entries on first use."""
+        if self._model is not None:
+            return
+        self._model = SentenceTransformer(_MODEL_NAME)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    vectors, self._responses = pickle.load(f)
+                if len(self._responses):
+                    self._index.add(vectors)
+            except Exception as e:
+                logger.warning(f"Failed to load semantic cache, starting empty: {e}")
+                self._responses = []
+
+    def _embed(self, text: str):
+        return self._model.encode([_normalize(text)], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, prompt: str, threshold: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for the most similar prompt, or None.
+
+        Args:
+            prompt: The formatted prompt about to be sent to the LLM
+            threshold: Optional similarity override for this lookup
+        """
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        if not self._responses:
+            return None
+        scores, ids = self._index.search(self._embed(prompt), 1)
+        score, idx = float(scores[0][0]), int(ids[0][0])
+        if idx >= 0 and score >= (threshold if threshold is not None else self.threshold):
+            logger.info(f"Semantic cache hit (similarity={score:.3f}).")
+            return self._responses[idx]
+        return None
+
+    def insert(self, prompt: str, response: Dict[str, Any]):
+        """Store a response under the prompt's embedding and persist to disk."""
+        if not self.enabled:
+            return
+        self._ensure_loaded()
+        self._index.add(self._embed(prompt))
+        self._responses.append(response)
+        try:
+            vectors = self._index.reconstruct_n(0, self._index.ntotal)
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump((vectors, self._responses), f)
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic cache: {e}")
+
+
+# Shared instance so the embedding model is loaded at most once per process
+_cache = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get the shared SemanticCache instance."""
+    global _cache
+    if _cache is None:
+        _cache = SemanticCache()
+    return _cache